@@ -11,9 +11,7 @@ if __name__ == "__main__":
 
     # load and clip the recorded cast
     full_cast = ascii.Recording.from_file("yaw_cli_raw.cast")
-    _, cast = full_cast.split_before(33)
-    cast, _ = cast.split_before(-3)
-    cast.trim()  # remove offset from clipped records
+    cast = full_cast.clip(33, -3)  # also removes offset from clipped records
     cast = cast.replace("/Users/janluca/dev/CCs/testing", "/Users/jlvdb")
 
     prompt = ascii.generate_prompt("jlvdb", "yaw")  # shows: 'jlvdb@yaw ~ $ '
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import copy
+import io
 import json
 import random
 import sys
 from collections.abc import Sequence
 from dataclasses import dataclass, field
+from itertools import accumulate, islice
 from time import sleep
 from typing import Iterator
 
@@ -39,25 +41,48 @@ class Colors:
     """Reset to default."""
 
 
-@dataclass
 class Record:
     """A single record (line) of a asciinema .cast file. Holds the time stamp,
-    second column (probably the output stream?) and the text with special
-    characters in ASCII representation (see sub_rules)."""
+    second column (probably the output stream?) and the text, which is
+    JSON-escaped when written to a file (see to_line)."""
 
-    time: float
-    """The time stamp."""
-    text: str
-    """The text associated with the time stamp."""
-    terminal: str = field(default="o")
-    """The output stream the text was written to."""
+    __slots__ = {
+        "time": "The time stamp.",
+        "text": "The text associated with the time stamp.",
+        "terminal": "The output stream the text was written to.",
+    }
+
+    def __init__(self, time: float, text: str, terminal: str = "o") -> None:
+        self.time = time
+        self.text = text
+        self.terminal = terminal
+
+    def __repr__(self) -> str:
+        string = self.__class__.__name__
+        time = self.time
+        text = self.text
+        terminal = self.terminal
+        string += f"({time=}, {text=}, {terminal=})"
+        return string
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Record):
+            return NotImplemented
+        return (self.time, self.text, self.terminal) == (
+            other.time,
+            other.text,
+            other.terminal,
+        )
 
     def __lt__(self, other: Record) -> bool:
         return self.time < other.time
 
     @classmethod
-    def from_line(cls, line: str) -> Record:
-        """Build an instance from a line of a .cast file."""
+    def from_line(cls, line: str | bytes) -> Record:
+        """Build an instance from a line of a .cast file, either decoded or as
+        raw bytes. Escape sequences are resolved by the JSON decoder."""
+        if isinstance(line, bytes):
+            line = line.decode()  # faster than letting json detect the encoding
         time, terminal, text = json.loads(line)
         return cls(time, text, terminal)
 
@@ -67,7 +92,7 @@ class Record:
 
     def copy(self) -> Record:
         """Make a copy of the instance"""
-        return copy.copy(self)
+        return Record(self.time, self.text, self.terminal)
 
 
 @dataclass(repr=False, eq=False)
@@ -106,10 +131,19 @@ class Recording(Sequence):
     @classmethod
     def from_file(cls, path: str) -> Recording:
         """Construct a new Recording instance from a asciinema .cast file."""
-        with open(path) as f:
-            lines = f.readlines()
-        header = json.loads(lines[0])
-        records = [Record.from_line(line) for line in lines[1:]]
+        records = []
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            lines = (line for line in f if not line.isspace())
+            # read line by line, but parse blocks of lines as single JSON arrays
+            while True:
+                block = list(islice(lines, 4096))
+                if not block:
+                    break
+                values = json.loads(b"[" + b",".join(block) + b"]")
+                records.extend(
+                    [Record(time, text, terminal) for time, terminal, text in values]
+                )
         return cls(header=header, records=records)
 
     @classmethod
@@ -163,23 +197,26 @@ class Recording(Sequence):
         """Create a copy of the instance"""
         new = Recording(
             copy.copy(self.header),
-            [rec.copy() for rec in self.records],
+            [Record(rec.time, rec.text, rec.terminal) for rec in self.records],
             start=self.start,
         )
         return new
 
     def replace(self, phrase: str, substitute: str) -> Recording:
         """Run a simple string replace on all stored records."""
-        new = self.copy()
-        for record in new:
-            record.text = record.text.replace(phrase, substitute)
-        return new
+        records = [
+            Record(rec.time, rec.text.replace(phrase, substitute), rec.terminal)
+            for rec in self.records
+        ]
+        return Recording(copy.copy(self.header), records, start=self.start)
 
     def apply_offset(self, offset: float) -> None:
         """Apply an offset to all time stamps. The starting time must be remain
         >=0.0."""
         start = self.start + offset
         self._check_bounds(start, self.end + offset)
+        if offset == 0.0:
+            return
         # apply offset
         self.start = start
         for record in self.records:
@@ -197,49 +234,75 @@ class Recording(Sequence):
         b = Recording(self.header, self.records[record_index:], a.end)
         return a, b
 
+    def clip(self, first: int, last: int) -> Recording:
+        """Create a new recording from the records between the two indices in the
+        list of records (like slicing) and remove the time offset. Equivalent to
+        splitting before both indices and trimming the middle part.
+        """
+        first, last, _ = slice(first, last).indices(len(self))
+        start = self.records[first - 1].time if first > 0 else self.start
+        records = [
+            Record(rec.time - start, rec.text, rec.terminal)
+            for rec in self.records[first:last]
+        ]
+        return Recording(self.header, records)
+
     def append(self, recording: Recording) -> None:
         """Append another recording to the end of this one."""
-        recording = recording.copy()
-        recording.apply_offset(self.end)
-        self.records.extend(recording.records)
+        # copy the records and apply the offset in a single pass
+        offset = self.end
+        self.records.extend(
+            [
+                Record(rec.time + offset, rec.text, rec.terminal)
+                for rec in recording.records
+            ]
+        )
 
     def modify_speed(self, speed: float) -> None:
-        """Scale the playback speed by this factor."""
+        """Scale the playback speed by this factor, must be positive."""
+        if speed <= 0.0:
+            raise ValueError(f"speed={speed} <= 0.0")
+        self.start /= speed
         for record in self.records:
-            record.time = record.time / speed
+            record.time /= speed
 
     def format(self) -> str:
         """Render the recording instantly into a single string."""
-        string = ""
-        for record in self.records:
-            string += record.text
-        return string
+        return "".join([record.text for record in self.records])
 
     def replay(self, speed=1.0):
         """Replay the recording to standard output at a given speed, defaults to
         real time playback."""
+        stdout = (sys.stdout.write, sys.stdout.flush)
+        stderr = (sys.stderr.write, sys.stderr.flush)
+        # precompute the delays and output streams before starting playback
+        plan = []
+        t_last = 0.0
+        for record in self.records:
+            stream = stdout if record.terminal == "o" else stderr
+            plan.append(((record.time - t_last) / speed, stream, record.text))
+            t_last = record.time
         try:
-            t_last = 0.0
-            for record in self.records:
-                t_delta = record.time - t_last
-                sleep(t_delta / speed)
-                if record.terminal == "o":
-                    _file = sys.stdout
-                else:
-                    _file = sys.stderr
-                _file.write(record.text)
-                _file.flush()
-                t_last = record.time
+            for delay, (write, flush), text in plan:
+                sleep(delay)
+                write(text)
+                flush()
         except KeyboardInterrupt:
             print("\n", end="\r")
             exit()
 
     def write(self, path: str) -> None:
         """Write a new asciinema-compatible .cast file."""
-        with open(path, "w") as f:
-            f.write(json.dumps(self.header) + "\n")
-            for record in self.records:
-                f.write(record.to_line() + "\n")
+        # JSON output is pure ASCII, encode the lines directly into a buffer
+        buffer = io.BytesIO()
+        write = buffer.write
+        write(json.dumps(self.header).encode())
+        write(b"\n")
+        for record in self.records:
+            write(record.to_line().encode())
+            write(b"\n")
+        with open(path, "wb") as f:
+            f.write(buffer.getbuffer())
 
 
 def generate_prompt(
@@ -276,10 +339,12 @@ def end(wait) -> Recording:
 def type_text(text: str, speed: float = 0.04, term: str = "o") -> Recording:
     """Type a sequence of characters at the given speed"""
     variance = 0.3 * speed
-    time_cul = 0.0
-    records = []
-    for char in text:
-        time_cul += speed + random.uniform(-variance, variance)
-        records.append(Record(time_cul, char, term))
+    # draw all delays at once, same as speed + uniform(-variance, variance)
+    rand = random.random
+    width = 2.0 * variance
+    delays = [speed + (width * rand() - variance) for _ in range(len(text))]
+    records = [
+        Record(time, char, term) for time, char in zip(accumulate(delays), text)
+    ]
     rec = Recording(dict(), records=records, start=0.0)
     return rec